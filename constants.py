@@ -9,14 +9,29 @@ AUTH_ROLES_COLLECTION = "auth_roles"
 MONGO_CONNECTION_URI = os.environ.get('MONGO_CONNECTION_URI')
 MONGO_DATABASE = os.environ.get('MONGO_DATABASE')
 
+# COLLECTION FIELD NAMES
+APPLICATION_NUMBER_FIELD = "applicationNumber_ErpStudentProfile_Text"
+ROLL_NUMBER_FIELD = "studentRollNumber_ErpStudentProfile_Text"
+SEMESTER_FIELD = "studentSemester_ErpStudentProfile_Int"
+SEMESTER_TYPE_FIELD = "studentSemesterType_ErpStudentProfile_Text"
+CLASS_FIELD = "studentClass_ErpStudentProfile_Text"
+COLLEGE_EMAIL_FIELD = "studentCollegeEmail_ErpStudentProfile_Text"
+DATE_OF_ADMISSION_FIELD = "studentDateOfAdmission_ErpStudentProfile_Date"
+IS_ACTIVE_FIELD = "isActive_KJUSYSCommon_Bool"
+USER_EMAIL_FIELD = "userEmail_AuthCommon_Text"
+USER_PASSWORD_FIELD = "userPassword_AuthCommon_Text"
+USER_CREATED_ON_FIELD = "createdOn_KJUSYSCommon_DateTime"
+USER_AUTH_ROLES_FIELD = "authRoles_AuthCommon_ObjectIdArray"
+AUTH_ROLE_NAME_FIELD = "authRoleName_AuthCommon_Text"
+
 # Map Excel column headers to collection field names
 EXCEL_TO_DB_FIELD_MAP = {
-    "Application Number": "applicationNumber_ErpStudentProfile_Text",
-    "RollNo": "studentRollNumber_ErpStudentProfile_Text",
-    "Semester": "studentSemester_ErpStudentProfile_Int",
-    "Semester Type": "studentSemesterType_ErpStudentProfile_Text",
-    "Class": "studentClass_ErpStudentProfile_Text",
-    "College Email Id": "studentCollegeEmail_ErpStudentProfile_Text",
-    "Date Of Admission": "studentDateOfAdmission_ErpStudentProfile_Date",
-    "Status": "isActive_KJUSYSCommon_Bool"
+    "Application Number": APPLICATION_NUMBER_FIELD,
+    "RollNo": ROLL_NUMBER_FIELD,
+    "Semester": SEMESTER_FIELD,
+    "Semester Type": SEMESTER_TYPE_FIELD,
+    "Class": CLASS_FIELD,
+    "College Email Id": COLLEGE_EMAIL_FIELD,
+    "Date Of Admission": DATE_OF_ADMISSION_FIELD,
+    "Status": IS_ACTIVE_FIELD
 }
@@ -1,10 +1,12 @@
 import pymongo
 import logging
+import os
 import re
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 import bcrypt
 from bson import ObjectId
-from pymongo import UpdateOne
+from pymongo import UpdateOne, UpdateMany
 from constants import *
 
 logger = logging.getLogger()
@@ -18,6 +20,11 @@ if not logger.hasHandlers():
 
 mongo_client = None
 DATABASE = None
+student_role_id_cache = None
+
+# Acceptable date formats: dd-mm-yyyy or dd/mm/yyyy
+DATE_RE = re.compile(r"(\d{2})[-/](\d{2})[-/](\d{4})")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
 
 def initialize_mongo_client() -> None:
     global mongo_client, DATABASE
@@ -29,13 +36,84 @@ def initialize_mongo_client() -> None:
                 maxPoolSize=5,
                 connectTimeoutMS=3000,
                 serverSelectionTimeoutMS=5000,
-                retryWrites=True
+                retryWrites=True,
+                compressors="zstd,zlib"
             )
             DATABASE = mongo_client.get_database(MONGO_DATABASE)
             logger.info("MongoDB connection initialized")
         except Exception as e:
             logger.exception("Failed to initialize MongoDB client")
             raise
+        ensure_indexes()
+
+def ensure_indexes() -> None:
+    """
+    Make sure the fields used as bulk write filters are indexed.
+    Runs once per cold start; create_index is a no-op if the index exists.
+    Failures are logged and do not block the batch.
+    """
+    for collection_name, field in (
+        (ERP_STUDENT_PROFILE_COLLECTION, APPLICATION_NUMBER_FIELD),
+        (AUTH_USERS_COLLECTION, USER_EMAIL_FIELD),
+    ):
+        try:
+            DATABASE.get_collection(collection_name).create_index(field, unique=True)
+        except Exception:
+            logger.exception(f"Failed to ensure index on {collection_name}.{field}")
+
+def _convert_status(value) -> bool:
+    # string 'active'/'inactive' to boolean, anything else is inactive
+    return isinstance(value, str) and value.strip().lower() == "active"
+
+def _convert_text(value) -> str:
+    if isinstance(value, str):
+        return value.upper()
+    elif value is not None:
+        return str(value).upper()
+    return ""
+
+def _convert_date(value):
+    if isinstance(value, str):
+        match = DATE_RE.match(value.strip())
+        if match:
+            try:
+                # date() rejects impossible dates (e.g. 30-02) in C
+                days = date(int(match.group(3)), int(match.group(2)), int(match.group(1))).toordinal()
+            except ValueError:
+                return None
+            return (days - _EPOCH_ORDINAL) * 86_400_000
+    return None
+
+def _convert_int(value):
+    try:
+        return int(value)
+    except:
+        return None
+
+def _convert_identity(value):
+    return value
+
+def _build_field_handlers() -> dict:
+    """
+    Classify each mapped collection field once at import time.
+    Returns {excel_col: (db_field, converter)}.
+    """
+    handlers = {}
+    for excel_col, db_field in EXCEL_TO_DB_FIELD_MAP.items():
+        if db_field == IS_ACTIVE_FIELD:
+            converter = _convert_status
+        elif db_field.endswith("_Text"):
+            converter = _convert_text
+        elif db_field.endswith("_Date"):
+            converter = _convert_date
+        elif db_field.endswith("_Int"):
+            converter = _convert_int
+        else:
+            converter = _convert_identity
+        handlers[excel_col] = (db_field, converter)
+    return handlers
+
+FIELD_HANDLERS = _build_field_handlers()
 
 def map_excel_row_to_db_fields(row: dict) -> dict:
     """
@@ -47,54 +125,10 @@ def map_excel_row_to_db_fields(row: dict) -> dict:
     Ignores unmapped fields.
     """
     mapped = {}
-    for excel_col, value in row.items():
-        db_field = EXCEL_TO_DB_FIELD_MAP.get(excel_col)
-        if not db_field:
-            continue
-
-        # Status field conversion
-        if db_field == "isActive_KJUSYSCommon_Bool":
-            if isinstance(value, str) and value.strip().lower() == "active":
-                mapped[db_field] = True
-            elif isinstance(value, str) and value.strip().lower() == "inactive":
-                mapped[db_field] = False
-            else:
-                mapped[db_field] = False
-
-        # _Text fields to uppercase
-        elif db_field.endswith("_Text"):
-            if isinstance(value, str):
-                mapped[db_field] = value.upper()
-            elif value is not None:
-                mapped[db_field] = str(value).upper()
-            else:
-                mapped[db_field] = ""
-
-        # _Date fields to millis
-        elif db_field.endswith("_Date"):
-            millis = None
-            if isinstance(value, str):
-                # Acceptable formats: dd-mm-yyyy or dd/mm/yyyy
-                match = re.match(r"(\d{2})[-/](\d{2})[-/](\d{4})", value.strip())
-                if match:
-                    day, month, year = match.groups()
-                    try:
-                        dt = datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
-                        millis = int(dt.timestamp() * 1000)
-                    except Exception:
-                        millis = None
-            mapped[db_field] = millis
-
-        # _Int fields to int
-        elif db_field.endswith("_Int"):
-            try:
-                mapped[db_field] = int(value)
-            except:
-                mapped[db_field] = None
-
-        # Default: keep as-is
-        else:
-            mapped[db_field] = value
+    # Walk the small fixed set of mapped columns rather than every column in the sheet
+    for excel_col, (db_field, converter) in FIELD_HANDLERS.items():
+        if excel_col in row:
+            mapped[db_field] = converter(row[excel_col])
     return mapped
 
 def hash_bcrypt(input_str: str) -> str:
@@ -104,14 +138,42 @@ def hash_bcrypt(input_str: str) -> str:
     hashed = bcrypt.hashpw(input_str.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
+def submit_bcrypt_hashes(executor: ThreadPoolExecutor, emails) -> dict:
+    """
+    Start hashing the given emails with bcrypt on the executor without waiting.
+    bcrypt releases the GIL while hashing, so threads scale with vCPUs and
+    the caller can do MongoDB I/O in the meantime.
+    Returns {email: future}.
+    """
+    return {email: executor.submit(hash_bcrypt, email) for email in emails}
+
+def collect_bcrypt_hashes(hash_futures: dict) -> dict:
+    """
+    Wait for the futures from submit_bcrypt_hashes.
+    Returns {email: hashed_password}; emails that failed to hash are omitted.
+    """
+    hashed_passwords = {}
+    for email, future in hash_futures.items():
+        try:
+            hashed_passwords[email] = future.result()
+        except Exception as e:
+            logger.error(f"Failed to hash password for email {email}: {e}")
+    return hashed_passwords
+
 def get_student_auth_role_object_id():
     """
     Fetch the ObjectId for the STUDENT role from the auth roles collection.
+    Cached across warm invocations once found.
     """
+    global student_role_id_cache
+    if student_role_id_cache is not None:
+        return student_role_id_cache
+
     auth_roles_collection = DATABASE.get_collection(AUTH_ROLES_COLLECTION)
-    doc = auth_roles_collection.find_one({"authRoleName_AuthCommon_Text": "STUDENT"}, {"_id": 1})
+    doc = auth_roles_collection.find_one({AUTH_ROLE_NAME_FIELD: "STUDENT"}, {"_id": 1})
     if doc and "_id" in doc:
-        return doc["_id"]
+        student_role_id_cache = doc["_id"]
+        return student_role_id_cache
     else:
         logger.error("STUDENT auth role not found in auth roles collection.")
         return None
@@ -139,73 +201,131 @@ def lambda_handler(event, context):
                 "failedRows": []
             }
 
-        operations = []
-        credentials_operations = []
-        app_numbers_in_batch = []
+        mapped_rows = [map_excel_row_to_db_fields(row) for row in batch]
 
-        for row in batch:
-            mapped_fields = map_excel_row_to_db_fields(row)
-            app_no = mapped_fields.get("applicationNumber_ErpStudentProfile_Text")
-            college_email = mapped_fields.get("studentCollegeEmail_ErpStudentProfile_Text")
+        app_numbers_in_batch = [
+            mapped_fields[APPLICATION_NUMBER_FIELD]
+            for mapped_fields in mapped_rows
+            if mapped_fields.get(APPLICATION_NUMBER_FIELD)
+        ]
+        # Find which app numbers are present in DB up front (returns only the strings, no cursor)
+        existing_app_numbers = set(student_profile_collection.distinct(
+            APPLICATION_NUMBER_FIELD,
+            {APPLICATION_NUMBER_FIELD: {"$in": app_numbers_in_batch}}
+        )) if app_numbers_in_batch else set()
 
-            if not app_no:
-                failed_application_numbers.append(row.get("Application Number", ""))
-                continue
+        college_emails = {
+            mapped_fields[COLLEGE_EMAIL_FIELD]
+            for mapped_fields in mapped_rows
+            if mapped_fields.get(APPLICATION_NUMBER_FIELD)
+            and mapped_fields.get(COLLEGE_EMAIL_FIELD)
+        }
+        # Users that already exist keep their password, so only new users need hashing
+        existing_emails = set(auth_users_collection.distinct(
+            USER_EMAIL_FIELD,
+            {USER_EMAIL_FIELD: {"$in": list(college_emails)}}
+        )) if college_emails else set()
 
-            app_numbers_in_batch.append(app_no)
-            update_fields = {k: v for k, v in mapped_fields.items() if k != "applicationNumber_ErpStudentProfile_Text"}
-            if update_fields:
-                operations.append(
-                    UpdateOne(
-                        {"applicationNumber_ErpStudentProfile_Text": app_no},
-                        {"$set": update_fields}
-                    )
+        # Same createdOn timestamp for every credential in this batch
+        now_millis = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            # Hash new passwords in the background while the student updates are written
+            hash_futures = submit_bcrypt_hashes(executor, college_emails - existing_emails)
+
+            # Merge repeated app numbers in row order so later rows win: {app_no: $set body}
+            updates_by_app_no = {}
+            row_app_numbers = []
+            for row, mapped_fields in zip(batch, mapped_rows):
+                # Remaining mapped fields become the $set body
+                app_no = mapped_fields.pop(APPLICATION_NUMBER_FIELD, None)
+                row_app_numbers.append(app_no)
+
+                if not app_no:
+                    failed_application_numbers.append(row.get("Application Number", ""))
+                elif app_no not in existing_app_numbers:
+                    # Not present in DB, no point sending an update for it
+                    failed_application_numbers.append(app_no)
+                elif app_no in updates_by_app_no:
+                    # Copy rather than update in place, the credentials loop still reads each row's fields
+                    updates_by_app_no[app_no] = {**updates_by_app_no[app_no], **mapped_fields}
+                elif mapped_fields:
+                    updates_by_app_no[app_no] = mapped_fields
+
+            # App numbers with an identical $set body share one update: {sorted (field, value) pairs: (body, [app_no])}
+            update_groups = {}
+            for app_no, update_fields in updates_by_app_no.items():
+                group_key = tuple(sorted(update_fields.items()))
+                group = update_groups.get(group_key)
+                if group is None:
+                    update_groups[group_key] = (update_fields, [app_no])
+                else:
+                    group[1].append(app_no)
+
+            operations = [
+                UpdateOne(
+                    {APPLICATION_NUMBER_FIELD: app_nos[0]},
+                    {"$set": update_fields}
+                ) if len(app_nos) == 1 else UpdateMany(
+                    {APPLICATION_NUMBER_FIELD: {"$in": app_nos}},
+                    {"$set": update_fields}
                 )
-            
+                for update_fields, app_nos in update_groups.values()
+            ]
+
+            # Execute student updates
+            if operations:
+                result = student_profile_collection.bulk_write(operations, ordered=False)
+                modified_count = result.modified_count
+                logger.info(f"Updated {modified_count} record(s)")
+
+            else:
+                logger.info("No updates to perform (no mappable fields found in batch)")
+
+            hashed_passwords = collect_bcrypt_hashes(hash_futures)
+
+        credentials_operations = []
+        for app_no, mapped_fields in zip(row_app_numbers, mapped_rows):
+            college_email = mapped_fields.get(COLLEGE_EMAIL_FIELD)
+
             # Add credentials for user
-            if college_email:
-                now_millis = int(datetime.now(timezone.utc).timestamp() * 1000)
-                try:
-                    hashed_password = hash_bcrypt(college_email)
-                except Exception as e:
-                    logger.error(f"Failed to hash password for email {college_email}: {e}")
-                    failed_application_numbers.append(app_no)
-                    continue
-                # Use the same status as in student profile
-                is_active_status = mapped_fields.get("isActive_KJUSYSCommon_Bool", True)
-                credentials_doc = {
-                    "userEmail_AuthCommon_Text": college_email,
-                    "userPassword_AuthCommon_Text": hashed_password,
-                    "isActive_KJUSYSCommon_Bool": is_active_status,
-                    "createdOn_KJUSYSCommon_DateTime": now_millis,
-                    "authRoles_AuthCommon_ObjectIdArray": [
-                        student_role_id if isinstance(student_role_id, ObjectId) else ObjectId(student_role_id)
-                    ] if student_role_id else []
-                }
+            if not app_no or not college_email:
+                continue
+
+            # Use the same status as in student profile
+            is_active_status = mapped_fields.get(IS_ACTIVE_FIELD, True)
+            if college_email in existing_emails:
                 credentials_operations.append(
                     UpdateOne(
-                        {"userEmail_AuthCommon_Text": college_email},
-                        {"$set": credentials_doc},
-                        upsert=True
+                        {USER_EMAIL_FIELD: college_email},
+                        {"$set": {IS_ACTIVE_FIELD: is_active_status}}
                     )
                 )
-        # Execute student updates
-        if operations:
-            result = student_profile_collection.bulk_write(operations, ordered=False)
-            modified_count = result.modified_count
-            logger.info(f"Updated {modified_count} record(s)")
-            
-            # Find which app numbers were not modified (possibly not present in DB)
-            present_docs = student_profile_collection.find(
-                {"applicationNumber_ErpStudentProfile_Text": {"$in": app_numbers_in_batch}},
-                {"applicationNumber_ErpStudentProfile_Text": 1, "_id": 0}
+                continue
+
+            hashed_password = hashed_passwords.get(college_email)
+            if hashed_password is None:
+                failed_application_numbers.append(app_no)
+                continue
+            # Immutable fields are only written when the user is first created
+            credentials_insert_doc = {
+                USER_PASSWORD_FIELD: hashed_password,
+                USER_CREATED_ON_FIELD: now_millis,
+                USER_AUTH_ROLES_FIELD: [
+                    student_role_id if isinstance(student_role_id, ObjectId) else ObjectId(student_role_id)
+                ] if student_role_id else []
+            }
+            credentials_operations.append(
+                UpdateOne(
+                    {USER_EMAIL_FIELD: college_email},
+                    {
+                        "$setOnInsert": credentials_insert_doc,
+                        "$set": {IS_ACTIVE_FIELD: is_active_status}
+                    },
+                    upsert=True
+                )
             )
-            updated_app_numbers = {doc["applicationNumber_ErpStudentProfile_Text"] for doc in present_docs}
-            failed_application_numbers += [app_no for app_no in app_numbers_in_batch if app_no not in updated_app_numbers]
 
-        else:
-            logger.info("No updates to perform (no mappable fields found in batch)")
-        
         # Execute credentials upserts
         if credentials_operations:
             credentials_result = auth_users_collection.bulk_write(credentials_operations, ordered=False)
@@ -220,12 +340,11 @@ def lambda_handler(event, context):
 
     except Exception as e:
         logger.exception("Unexpected exception in worker lambda")
-        # batch is always defined above
+        # batch is always defined above; dict.fromkeys dedupes in O(n) keeping order
         return {
             "success": False,
             "message": f"Unhandled exception: {str(e)}",
-            "failedRows": failed_application_numbers + [
-                row.get("Application Number", "") for row in batch
-                if row.get("Application Number", "") not in failed_application_numbers
-            ]
+            "failedRows": list(dict.fromkeys(
+                failed_application_numbers + [row.get("Application Number", "") for row in batch]
+            ))
         }
\ No newline at end of file